@@ -0,0 +1,95 @@
+'''
+Pipeline benchmark
+Compares the end-to-end throughput of a multi-sample run processed sequentially (read, process,
+write one file after the other) and with concurrent_pipeline.run_pipeline() (reading of the next
+file overlapping processing and writing of the current ones).
+Slow storage is simulated by throttling the reads to a given bandwidth.
+-----------------------------------------------------------
+Usage example:
+python benchmark_pipeline.py fastq reads.fastq
+python benchmark_pipeline.py tsv alignment.b6 --copies 8 --bandwidth 2 --queue-size 2
+
+The input file is copied --copies times into a temporary directory, which is also used as the
+working directory, so the output files do not overwrite the ones in this directory.
+'''
+
+import argparse
+import functools
+import io
+import os
+import shutil
+import tempfile
+import time
+
+def throttled_read_blocks(in_file, bandwidth, block_size=64 * 1024):
+    ''' Takes the name of a text file and a read bandwidth (MB/s) as input.
+        Reads the file block by block, sleeping after each block as slow storage would.
+        Returns the content of the file as an in-memory text handle (io.StringIO), like concurrent_pipeline.read_blocks().
+    '''
+    text_handle = io.StringIO()
+    with open(in_file, 'r') as fh:
+        for block in iter(lambda: fh.read(block_size), ''):
+            time.sleep(len(block) / (bandwidth * 1024 * 1024))
+            text_handle.write(block)
+    text_handle.seek(0)
+    return text_handle
+
+def run_sequential(module, in_files, read_func):
+    ''' Takes fastq_processing or tsv_processing and a list of input files as input.
+        Runs the stages of module.run_samples() one after the other for each file.
+        Returns the names of the output files of each input (list of tuples).
+    '''
+    multi_sample = len(in_files) > 1
+    written = []
+    for in_file in in_files:
+        data = module.read_sample(in_file, read_func=read_func)
+        result = module.process_sample(data)
+        written.append(module.write_sample(in_file, result, multi_sample=multi_sample))
+    return written
+
+def time_run(run_func):
+    start = time.perf_counter()
+    run_func()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sequential vs concurrent multi-sample processing.')
+    parser.add_argument('task', choices=['fastq', 'tsv'])
+    parser.add_argument('in_file')
+    parser.add_argument('--copies', type=int, default=8, help='number of samples (copies of in_file)')
+    parser.add_argument('--bandwidth', type=float, default=1.0, help='simulated read bandwidth in MB/s')
+    parser.add_argument('--queue-size', type=int, default=2, help='bound of the pipeline queues')
+    args = parser.parse_args()
+    if args.copies < 2:
+        parser.error('--copies must be at least 2 (a single input is not run through the pipeline)')
+
+    if args.task == 'fastq':
+        import fastq_processing as module
+    else:
+        import tsv_processing as module
+
+    read_func = functools.partial(throttled_read_blocks, bandwidth=args.bandwidth)
+    in_file = os.path.abspath(args.in_file)
+    size_mb = os.stat(in_file).st_size / (1024 * 1024)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            in_files = []
+            for i in range(args.copies):
+                copy = os.path.join(tmp_dir, 'sample_%d_%s'%(i, os.path.basename(in_file)))
+                shutil.copy(in_file, copy)
+                in_files.append(copy)
+            seq_time = time_run(lambda: run_sequential(module, in_files, read_func))
+            pipe_time = time_run(lambda: module.run_samples(in_files, read_func=read_func, queue_size=args.queue_size))
+        finally:
+            os.chdir(cwd)
+
+    total_mb = size_mb * args.copies
+    print('samples: %d, input: %.2f MB, simulated bandwidth: %.2f MB/s'%(args.copies, total_mb, args.bandwidth))
+    print('sequential: %.2f s (%.2f MB/s, %.2f samples/s)'%(seq_time, total_mb / seq_time, args.copies / seq_time))
+    print('pipeline:   %.2f s (%.2f MB/s, %.2f samples/s)'%(pipe_time, total_mb / pipe_time, args.copies / pipe_time))
+    print('speedup:    %.2fx'%(seq_time / pipe_time))
+
+if __name__ == '__main__':
+    main()
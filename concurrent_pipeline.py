@@ -0,0 +1,111 @@
+'''
+Concurrent I/O pipeline
+Runs a multi-sample job (several FASTQ or TSV input files) as three overlapping stages, so that
+the next input file is read while the current one is processed and the outputs (PDF/TSV/CSV)
+of the previous one are written.
+-----------------------------------------------------------
+reader      ->  bounded queue  ->  processor  ->  bounded queue  ->  writer
+(thread)                           (thread)                          (single thread)
+
+Both queues are bounded (queue_size). Counting the item each stage is working on and the item
+the reader holds while waiting for room in the first queue, at most 2*queue_size + 3 samples
+(inputs or results) are held in memory at once.
+The writer stage runs in its own background thread, one sample at a time. The writing functions
+of the scripts draw on explicit matplotlib Figure objects instead of the pyplot state machine,
+so plotting and saving off the main thread does not involve any GUI backend.
+-----------------------------------------------------------
+Used by: fastq_processing.py and tsv_processing.py (run_samples()).
+Benchmark: benchmark_pipeline.py
+'''
+
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+BLOCK_SIZE = 1024 * 1024 # bytes read per block by read_blocks()
+
+def read_blocks(in_file, block_size=BLOCK_SIZE):
+    ''' Takes the name of a (decompressed) text input file as input.
+        Reads the file block by block.
+        Returns the content of the file as an in-memory text handle (io.StringIO), positioned at the start.
+    '''
+    text_handle = io.StringIO()
+    with open(in_file, 'r') as fh:
+        for block in iter(lambda: fh.read(block_size), ''):
+            text_handle.write(block)
+    text_handle.seek(0)
+    return text_handle
+
+async def _reader(in_files, read_func, executor, in_queue):
+    loop = asyncio.get_running_loop()
+    for in_file in in_files:
+        data = await loop.run_in_executor(executor, read_func, in_file)
+        await in_queue.put((in_file, data))
+    await in_queue.put(None)
+
+async def _processor(process_func, executor, in_queue, out_queue):
+    loop = asyncio.get_running_loop()
+    while True:
+        item = await in_queue.get()
+        if item is None:
+            break
+        in_file, data = item
+        result = await loop.run_in_executor(executor, process_func, data)
+        del item, data # do not keep the input alive while waiting on the queues
+        await out_queue.put((in_file, result))
+        del result
+    await out_queue.put(None)
+
+async def _writer(write_func, executor, out_queue, written):
+    loop = asyncio.get_running_loop()
+    while True:
+        item = await out_queue.get()
+        if item is None:
+            break
+        in_file, result = item
+        written.append(await loop.run_in_executor(executor, write_func, in_file, result))
+        del item, result # do not keep the result alive while waiting on the queue
+
+async def _run_pipeline(in_files, read_func, process_func, write_func, queue_size):
+    in_queue = asyncio.Queue(maxsize=queue_size)
+    out_queue = asyncio.Queue(maxsize=queue_size)
+    written = []
+    with ThreadPoolExecutor(max_workers=1) as read_executor, \
+         ThreadPoolExecutor(max_workers=1) as process_executor, \
+         ThreadPoolExecutor(max_workers=1) as write_executor:
+        tasks = [asyncio.ensure_future(_reader(in_files, read_func, read_executor, in_queue)),
+                 asyncio.ensure_future(_processor(process_func, process_executor, in_queue, out_queue)),
+                 asyncio.ensure_future(_writer(write_func, write_executor, out_queue, written))]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # a failing stage would leave the others blocked on a full/empty queue
+            for task in tasks:
+                task.cancel()
+            raise
+    return written
+
+def check_output_names(in_files, output_names_func):
+    ''' Takes a list of input files and a function returning the output file names of an input (tuple).
+        Raises ValueError if two inputs would write the same output file
+        (e.g. inputs with the same file name in different directories would silently overwrite each other's outputs).
+    '''
+    out_files = [name for in_file in in_files for name in output_names_func(in_file)]
+    if len(set(out_files)) < len(out_files):
+        raise ValueError('Input files with the same name (output files would be overwritten): %s'%(', '.join(map(str, in_files))))
+
+def run_pipeline(in_files, read_func, process_func, write_func, queue_size=2, output_names_func=None):
+    ''' Takes a list of input files and the three stage functions as input:
+        read_func(in_file) -> data, process_func(data) -> result, write_func(in_file, result) -> output.
+        Runs the stages concurrently, keeping at most queue_size items between two stages
+        (at most 2*queue_size + 3 samples in memory in total). Each stage runs in its own thread.
+        If output_names_func is given, the output names are checked with check_output_names() before starting.
+        Returns the outputs of write_func (list), in the order of the input files.
+        Errors raised by any stage are re-raised.
+    '''
+    if queue_size < 1:
+        raise ValueError('queue_size must be at least 1...')
+    in_files = list(in_files)
+    if output_names_func is not None:
+        check_output_names(in_files, output_names_func)
+    return asyncio.run(_run_pipeline(in_files, read_func, process_func, write_func, queue_size))
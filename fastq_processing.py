@@ -36,10 +36,12 @@ Sample output (see the original pdf file of the tasks):
 import sys
 from Bio import SeqIO
 import pandas as pd
-from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
 import pathlib
 import subprocess
 import os
+import functools
+import concurrent_pipeline
 
 def check_zip_status(fq_file):
     ''' Takes the fastq input file as input.
@@ -77,32 +79,34 @@ def prepare_stats(phred_df):
     #desc.to_csv('test_ref_desc_df_for_reads.fastq.tsv', index=False, sep='\t') # the file is used later for unit testing (for reads.fastq)
     return desc
 
-def prepare_tsv(desc_df):
+def prepare_tsv(desc_df, out_file='fastq_processing_output_dataframe_Phred_mean_std_fastq_reads.tsv'):
     ''' Takes the dataframe from prepare_stats() as input.
-        Saves the data in a .tsv file formatted as requested.
+        Saves the data in a .tsv file (out_file) formatted as requested.
     '''
     tsv_df = desc_df.drop(columns=[col for col in desc_df.columns if not col in ['mean', 'std']]).copy()
     tsv_df.loc[:, 'read_position'] = tsv_df.index + 1
     tsv_df = tsv_df.rename({'mean':'mean_Phred_qual', 'std':'standard_deviation_Phred_qual'}, axis=1)
     tsv_df = tsv_df.loc[:, ['read_position', 'mean_Phred_qual', 'standard_deviation_Phred_qual']]
-    tsv_df.to_csv('fastq_processing_output_dataframe_Phred_mean_std_fastq_reads.tsv', index= False, sep='\t')
+    tsv_df.to_csv(out_file, index= False, sep='\t')
     return tsv_df
 
-def plot_figure(desc_df):
+def plot_figure(desc_df, out_file='fastq_processing_output_figure_mean_std_fastq_reads.pdf'):
     ''' Takes the dataframe from prepare_stats() as input.
-        Plots and saves the figure in a pdf file.
+        Plots and saves the figure in a pdf file (out_file).
     '''
     fig_df = desc_df.copy()
     fig_df.index += 1
     read_length = len(fig_df)
-    plt.figure(figsize=(14, 8))
-    fig_df.plot(y='mean', yerr='std', kind='bar', legend=None)
-    plt.xticks(range(0, read_length+1, 2), fontsize=5, rotation=0)
-    plt.xlabel('read position')
-    plt.ylabel('mean Phred quality')
-    plt.tight_layout()
-    plt.savefig('fastq_processing_output_figure_mean_std_fastq_reads.pdf')
-    plt.clf()
+    # an explicit Figure (default size, as before) instead of pyplot: nothing global to clean up, and safe in the writer thread of run_samples()
+    fig = Figure()
+    ax = fig.subplots()
+    fig_df.plot(y='mean', yerr='std', kind='bar', legend=None, ax=ax)
+    ax.set_xticks(range(0, read_length+1, 2))
+    ax.tick_params(axis='x', labelsize=5, labelrotation=0)
+    ax.set_xlabel('read position')
+    ax.set_ylabel('mean Phred quality')
+    fig.tight_layout()
+    fig.savefig(out_file)
     del fig_df
     return
 
@@ -122,17 +126,71 @@ def check_output_file(out_file):
     except FileNotFoundError:
         raise 
 
+def output_file_names(fq_file, multi_sample):
+    ''' Takes the name of an input fastq file and whether more than one file is processed.
+        Returns the names of the output pdf and tsv files (tuple).
+        A single input keeps the original output names; with multiple inputs the names carry the input file name.
+    '''
+    if not multi_sample:
+        return ('fastq_processing_output_figure_mean_std_fastq_reads.pdf', 'fastq_processing_output_dataframe_Phred_mean_std_fastq_reads.tsv')
+    sample = pathlib.Path(fq_file).name
+    if sample.endswith('.gz'):
+        sample = sample[:-len('.gz')]
+    return ('fastq_processing_output_figure_mean_std_%s.pdf'%(sample), 'fastq_processing_output_dataframe_Phred_mean_std_%s.tsv'%(sample))
+
+def read_sample(fq_file, read_func=concurrent_pipeline.read_blocks):
+    ''' Reader stage of run_samples().
+        Takes a (possibly gzip compressed) fastq file as input.
+        Returns the content of the decompressed file as an in-memory text handle (from read_func).
+    '''
+    fq_file, zipped = check_zip_status(fq_file)
+    return read_func(fq_file)
+
+def process_sample(fq_handle):
+    ''' Processor stage of run_samples().
+        Takes the text handle from read_sample() (or the name of a decompressed fastq file) as input.
+        Returns the dataframe from prepare_stats().
+    '''
+    return prepare_stats(parse_fastq(fq_handle))
+
+def write_sample(fq_file, desc_df, multi_sample=False):
+    ''' Writer stage of run_samples().
+        Takes the input fastq file name and the dataframe from process_sample() as input.
+        Saves the pdf and tsv files, checks them and returns their names (tuple).
+    '''
+    pdf_file, tsv_file = output_file_names(fq_file, multi_sample)
+    plot_figure(desc_df, pdf_file)
+    prepare_tsv(desc_df, tsv_file)
+    assert check_output_file(pdf_file) == True
+    assert check_output_file(tsv_file) == True
+    return (pdf_file, tsv_file)
+
+def run_samples(fastq_files, read_func=concurrent_pipeline.read_blocks, queue_size=2):
+    ''' Takes a list of fastq files as input.
+        Processes them with concurrent_pipeline.run_pipeline(): the next file is read while the current
+        one is parsed and the outputs of the previous one are written.
+        A single input is processed straight from the file, without the pipeline.
+        Returns the names of the output files of each input (list of tuples).
+        Raises ValueError if two inputs would write the same output files.
+    '''
+    if len(fastq_files) == 1:
+        # nothing to overlap: parse straight from the file, without holding it in memory
+        fq_file, zipped = check_zip_status(fastq_files[0])
+        return [write_sample(fastq_files[0], process_sample(fq_file))]
+    return concurrent_pipeline.run_pipeline(fastq_files,
+                                            functools.partial(read_sample, read_func=read_func),
+                                            process_sample,
+                                            functools.partial(write_sample, multi_sample=True),
+                                            queue_size=queue_size,
+                                            output_names_func=functools.partial(output_file_names, multi_sample=True))
+
 def main():
-    fastq_file = sys.argv[-1]
-    if fastq_file == 'fastq_processing.py':
+    ''' Usage example: python fastq_processing.py reads.fastq [more_reads.fastq ...]
+    '''
+    fastq_files = sys.argv[1:]
+    if not fastq_files:
         raise ValueError('No input file provided...')
-    fastq_file, zipped = check_zip_status(fastq_file)
-    phred_scores = parse_fastq(fastq_file)
-    data_df = prepare_stats(phred_scores)
-    plot_figure(data_df)
-    prepare_tsv(data_df)
-    assert check_output_file('fastq_processing_output_figure_mean_std_fastq_reads.pdf') == True
-    assert check_output_file('fastq_processing_output_dataframe_Phred_mean_std_fastq_reads.tsv') == True
+    run_samples(fastq_files)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,64 @@
+import unittest
+import concurrent_pipeline
+import threading
+import time
+
+class TestConcurrentPipeline(unittest.TestCase):
+
+    def test_read_blocks(self):
+        with open('./test/reads.fastq') as fh:
+            test_ref_text = fh.read()
+        self.assertEqual(concurrent_pipeline.read_blocks('./test/reads.fastq', block_size=1000).read(), test_ref_text)
+
+    def test_run_pipeline_order(self):
+        in_files = ['a', 'b', 'c', 'd']
+        func_out = concurrent_pipeline.run_pipeline(in_files, lambda f: f.upper(), lambda d: d * 2, lambda f, r: (f, r))
+        self.assertEqual(func_out, [('a', 'AA'), ('b', 'BB'), ('c', 'CC'), ('d', 'DD')])
+
+    def test_run_pipeline_stage_threads(self):
+        # writes (plotting) are kept on one background thread, apart from the reading and processing threads
+        threads = {'read': set(), 'process': set(), 'write': set()}
+        def record(stage):
+            threads[stage].add(threading.get_ident())
+        concurrent_pipeline.run_pipeline(range(5), lambda f: record('read'), lambda d: record('process'), lambda f, r: record('write'))
+        self.assertEqual(len(threads['write']), 1)
+        self.assertNotIn(threading.get_ident(), threads['write'])
+        self.assertTrue(threads['write'].isdisjoint(threads['read'] | threads['process']))
+
+    def test_run_pipeline_bounded_queues(self):
+        # with a slow writer, the reader must not run ahead by more than the two queues (+ the item in each stage)
+        queue_size = 1
+        state = {'read': 0, 'max_ahead': 0, 'written': 0}
+        def read_func(f):
+            state['read'] += 1
+            state['max_ahead'] = max(state['max_ahead'], state['read'] - state['written'])
+            return f
+        def write_func(f, r):
+            time.sleep(0.01)
+            state['written'] += 1
+            return r
+        concurrent_pipeline.run_pipeline(range(10), read_func, lambda d: d, write_func, queue_size=queue_size)
+        self.assertLessEqual(state['max_ahead'], 2 * queue_size + 3)
+
+    def test_run_pipeline_errors(self):
+        with self.assertRaises(ValueError):
+            concurrent_pipeline.run_pipeline(['a'], str, str, lambda f, r: r, queue_size=0)
+
+        def process_func(d):
+            raise ValueError('flawed input: %s'%(d))
+        with self.assertRaises(ValueError):
+            concurrent_pipeline.run_pipeline(range(10), lambda f: f, process_func, lambda f, r: r, queue_size=1)
+
+    def test_check_output_names(self):
+        output_names_func = lambda f: ('out_%s.pdf'%(f.split('/')[-1]), 'out_%s.tsv'%(f.split('/')[-1]))
+        concurrent_pipeline.check_output_names(['run1/a', 'run1/b'], output_names_func)
+        with self.assertRaises(ValueError):
+            concurrent_pipeline.check_output_names(['run1/a', 'run2/a'], output_names_func)
+
+        read_files = []
+        with self.assertRaises(ValueError):
+            concurrent_pipeline.run_pipeline(['run1/a', 'run2/a'], read_files.append, str, lambda f, r: r, output_names_func=output_names_func)
+        self.assertEqual(read_files, []) # checked before anything is read
+
+if __name__ == '__main__':
+    unittest.main()
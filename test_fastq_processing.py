@@ -4,6 +4,7 @@ import pathlib
 import os
 import subprocess
 import pandas as pd
+from matplotlib import pyplot as plt
 
 class TestFileBase(unittest.TestCase):
 
@@ -70,14 +71,74 @@ class TestFastqProcessing(unittest.TestCase):
 
         #self.assertTrue(func_out_df.equals(test_ref_df))
         pd.testing.assert_frame_equal(func_out_df, test_ref_df)
+        self.assertTrue(fastq_processing.check_output_file('fastq_processing_output_dataframe_Phred_mean_std_fastq_reads.tsv')) # default output file
+
+        fastq_processing.prepare_tsv(func_in_df, 'tmp_test_prepare_tsv.tsv')
+        pd.testing.assert_frame_equal(pd.read_table('tmp_test_prepare_tsv.tsv'), test_ref_df)
+        os.remove('tmp_test_prepare_tsv.tsv')
 
     def test_plot_figure(self):
-        ''' This step seemed to be unneccesarily complicated.
+        ''' Checking the drawing itself seemed to be unneccesarily complicated.
         Assuming that pyplot correctly draws the figure based on the data provided,
         test_parse_fastq(), test_prepare_stats(), and test_prepare_tsv()
         are sufficient for testing functionalities of fastq_processing.py.
+        Here we only check that the pdf file is saved with the original page size and that no figure is left open.
         '''
-        pass
+        func_in_df = pd.read_table('./test/test_ref_desc_df_for_reads.fastq.tsv')
+        open_figures = plt.get_fignums()
+        fastq_processing.plot_figure(func_in_df, 'tmp_test_plot_figure.pdf')
+        self.assertTrue(fastq_processing.check_output_file('tmp_test_plot_figure.pdf'))
+        self.assertEqual(plt.get_fignums(), open_figures) # no pyplot figure is left open
+        with open('tmp_test_plot_figure.pdf', 'rb') as fh:
+            self.assertIn(b'/MediaBox [ 0 0 460.8 345.6 ]', fh.read()) # same page size as fastq_processing_output_figure_mean_std_fastq_reads.pdf
+        os.remove('tmp_test_plot_figure.pdf')
+
+    def test_output_file_names(self):
+        # single input: original output names
+        self.assertEqual(fastq_processing.output_file_names('./test/reads.fastq', False), ('fastq_processing_output_figure_mean_std_fastq_reads.pdf', 'fastq_processing_output_dataframe_Phred_mean_std_fastq_reads.tsv'))
+        # multiple inputs: the names carry the (decompressed) input file name
+        self.assertEqual(fastq_processing.output_file_names('./test/reads_zipped.fastq.gz', True), ('fastq_processing_output_figure_mean_std_reads_zipped.fastq.pdf', 'fastq_processing_output_dataframe_Phred_mean_std_reads_zipped.fastq.tsv'))
+
+    def test_read_sample(self):
+        with open('./test/reads.fastq') as fh:
+            test_ref_text = fh.read()
+        self.assertEqual(fastq_processing.read_sample('./test/reads.fastq').read(), test_ref_text)
+        self.assertEqual(fastq_processing.read_sample('./test/reads_zipped.fastq.gz').read(), test_ref_text) # same reads, gzip compressed
+
+        subprocess.run('gzip ./test/reads_zipped.fastq', shell=True) # to keep this test file zipped for later tests
+
+    def test_process_sample(self):
+        test_ref_desc_df = pd.read_table('./test/test_ref_desc_df_for_reads.fastq.tsv')
+        func_out_desc_df = fastq_processing.process_sample(fastq_processing.read_sample('./test/reads.fastq'))
+        pd.testing.assert_frame_equal(func_out_desc_df, test_ref_desc_df)
+
+    def test_write_sample(self):
+        test_ref_df = pd.read_table('./test/test_ref_dataframe_Phred_mean_std_fastq_reads.tsv')
+        func_in_df = pd.read_table('./test/test_ref_desc_df_for_reads.fastq.tsv')
+        out_files = fastq_processing.write_sample('./test/reads.fastq', func_in_df, multi_sample=True)
+        self.assertEqual(out_files, fastq_processing.output_file_names('./test/reads.fastq', True))
+        pd.testing.assert_frame_equal(pd.read_table(out_files[1]), test_ref_df)
+        for out_file in out_files:
+            os.remove(out_file)
+
+    def test_run_samples(self):
+        with self.assertRaises(ValueError):
+            fastq_processing.run_samples(['./test/reads.fastq', './reads.fastq']) # same file name in different directories
+        with self.assertRaises(ValueError):
+            fastq_processing.run_samples(['./test/reads.fastq', './test/reads.fastq.gz']) # same file name once decompressed
+
+        test_ref_df = pd.read_table('./test/test_ref_dataframe_Phred_mean_std_fastq_reads.tsv')
+        in_files = ['./test/reads.fastq', './test/reads_zipped.fastq.gz'] # same reads, plain and gzip compressed
+        func_out_files = fastq_processing.run_samples(in_files)
+        subprocess.run('gzip ./test/reads_zipped.fastq', shell=True) # to keep this test file zipped for later tests
+
+        self.assertEqual(func_out_files, [fastq_processing.output_file_names(in_file, True) for in_file in in_files])
+        for pdf_file, tsv_file in func_out_files:
+            self.assertTrue(fastq_processing.check_output_file(pdf_file))
+            pd.testing.assert_frame_equal(pd.read_table(tsv_file), test_ref_df)
+            os.remove(pdf_file)
+            os.remove(tsv_file)
+
 
 if __name__ == '__main__':
     unittest.main()
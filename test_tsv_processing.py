@@ -78,6 +78,11 @@ class TestTsvProcessing(unittest.TestCase):
 
         #self.assertTrue(func_out_df.equals(test_ref_hist_df))
         pd.testing.assert_frame_equal(func_out_df, test_ref_hist_df)
+        self.assertTrue(tsv_processing.check_output_file('tsv_processing_output_histogram_data.csv')) # default output file
+
+        tsv_processing.save_csv_file(test_in_df, 'tmp_test_save_csv_file.csv')
+        pd.testing.assert_frame_equal(pd.read_csv('tmp_test_save_csv_file.csv'), test_ref_hist_df)
+        os.remove('tmp_test_save_csv_file.csv')
 
     def test_plot_histogram(self):
         
@@ -87,6 +92,57 @@ class TestTsvProcessing(unittest.TestCase):
 
         #self.assertTrue(func_out_hist_df.equals(test_ref_hist_df))
         pd.testing.assert_frame_equal(func_out_hist_df, test_ref_hist_df)
+        self.assertTrue(tsv_processing.check_output_file('tsv_processing_output_figure_histogram_alignment_length.pdf')) # default output file
+
+        # each call draws on its own figure, so a second histogram does not pile up on the first one
+        func_out_hist_df = tsv_processing.plot_histogram(func_in_df, 'tmp_test_plot_histogram.pdf')
+        pd.testing.assert_frame_equal(func_out_hist_df, test_ref_hist_df)
+        self.assertTrue(tsv_processing.check_output_file('tmp_test_plot_histogram.pdf'))
+        with open('tmp_test_plot_histogram.pdf', 'rb') as fh:
+            self.assertIn(b'/MediaBox [ 0 0 460.8 345.6 ]', fh.read()) # same page size as tsv_processing_output_figure_histogram_alignment_length.pdf
+        os.remove('tmp_test_plot_histogram.pdf')
+
+    def test_output_file_names(self):
+        # single input: original output names
+        self.assertEqual(tsv_processing.output_file_names('./test/alignment.b6', False), ('tsv_processing_output_figure_histogram_alignment_length.pdf', 'tsv_processing_output_histogram_data.csv'))
+        # multiple inputs: the names carry the input file name
+        self.assertEqual(tsv_processing.output_file_names('./test/alignment.b6', True), ('tsv_processing_output_figure_histogram_alignment_length_alignment.b6.pdf', 'tsv_processing_output_histogram_data_alignment.b6.csv'))
+
+    def test_read_sample(self):
+        with open('./test/alignment.b6') as fh:
+            test_ref_text = fh.read()
+        self.assertEqual(tsv_processing.read_sample('./test/alignment.b6').read(), test_ref_text)
+
+    def test_process_sample(self):
+        test_out_df = pd.read_table('./test/test_ref_dataframe_best_alignments_for_alignment.b6.tsv')
+        test_out_df.loc[:, 'evalue'] = -np.log10(test_out_df.loc[:, 'evalue'])
+        func_out_df = tsv_processing.process_sample(tsv_processing.read_sample('./test/alignment.b6'))
+        func_out_df.loc[:, 'evalue'] = -np.log10(func_out_df.loc[:, 'evalue'])
+        pd.testing.assert_frame_equal(test_out_df, func_out_df)
+
+    def test_write_sample(self):
+        test_ref_hist_df = pd.read_csv('./test/test_ref_tsv_processing_output_histogram_data.csv')
+        func_in_df = pd.read_table('./test/test_ref_dataframe_best_alignments_for_alignment.b6.tsv')
+        out_files = tsv_processing.write_sample('./test/alignment.b6', func_in_df, multi_sample=True)
+        self.assertEqual(out_files, tsv_processing.output_file_names('./test/alignment.b6', True))
+        pd.testing.assert_frame_equal(pd.read_csv(out_files[1]), test_ref_hist_df)
+        for out_file in out_files:
+            os.remove(out_file)
+
+    def test_run_samples(self):
+        with self.assertRaises(ValueError):
+            tsv_processing.run_samples(['./test/alignment.b6', './alignment.b6']) # same file name in different directories
+
+        test_ref_hist_df = pd.read_csv('./test/test_ref_tsv_processing_output_histogram_data.csv')
+        in_files = ['./test/alignment.b6', './test/tmp_df_alignment.b6_with_header'] # same alignments, without and with header
+        func_out_files = tsv_processing.run_samples(in_files)
+
+        self.assertEqual(func_out_files, [tsv_processing.output_file_names(in_file, True) for in_file in in_files])
+        for pdf_file, csv_file in func_out_files:
+            self.assertTrue(tsv_processing.check_output_file(pdf_file))
+            pd.testing.assert_frame_equal(pd.read_csv(csv_file), test_ref_hist_df)
+            os.remove(pdf_file)
+            os.remove(csv_file)
         
 
 
@@ -84,11 +84,14 @@ alignment_length,abundance
 
 import pandas as pd
 import numpy as np
-from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 import sys
 import os
+import pathlib
+import functools
 import pandas.api.types as ptypes
+import concurrent_pipeline
 
 def preprocess_aln_file(aln_file):
     ''' Takes the alignment tsv file as input.
@@ -166,17 +169,19 @@ def return_best_alignment(preprocessed_dataframe):
     #df.to_csv('test_ref_dataframe_best_alignments_for_alignment.b6.tsv', sep='\t', index=False) # alignment input: alignment.b6; the tsv file is used in unit testing
     return df
 
-def save_csv_file(best_df):
+def save_csv_file(best_df, out_file='tsv_processing_output_histogram_data.csv'):
     values_df = best_df['length'].value_counts().reset_index()
     values_df.columns = ['alignment_length', 'abundance']
     values_df = values_df.sort_values('alignment_length')
     values_df = values_df.reset_index(drop=True)
-    values_df.to_csv('tsv_processing_output_histogram_data.csv', index=False)
+    values_df.to_csv(out_file, index=False)
     return values_df
 
-def plot_histogram(best_df):
-    sns.histplot(best_df, x='length', binwidth=1)
-    ax = plt.gca()
+def plot_histogram(best_df, out_file='tsv_processing_output_figure_histogram_alignment_length.pdf'):
+    # an explicit Figure (default size, as before) instead of pyplot: each sample starts on an empty figure, safe in the writer thread of run_samples()
+    fig = Figure()
+    ax = fig.subplots()
+    sns.histplot(best_df, x='length', binwidth=1, ax=ax)
     patches = ax.patches
     #xy_coords = [p.get_xy() for p in patches]
     all_x_vals = [p.get_xy()[0] for p in patches]
@@ -185,8 +190,7 @@ def plot_histogram(best_df):
     ref_hist_df = pd.DataFrame({'x': all_x_vals, 'width': all_widths, 'height': all_heights})
     #ref_hist_df.to_csv('test_ref_dataframe_sns_histogram_values', sep='\t', index=False) # alignment input: alignment.b6; the tsv file is used in unit testing
 
-    plt.savefig('tsv_processing_output_figure_histogram_alignment_length.pdf')
-    #plt.clf()
+    fig.savefig(out_file)
     return ref_hist_df
 
 def check_output_file(out_file):
@@ -206,18 +210,67 @@ def check_output_file(out_file):
         raise
 
 
+def output_file_names(aln_file, multi_sample):
+    ''' Takes the name of an input alignment file and whether more than one file is processed.
+        Returns the names of the output pdf and csv files (tuple).
+        A single input keeps the original output names; with multiple inputs the names carry the input file name.
+    '''
+    if not multi_sample:
+        return ('tsv_processing_output_figure_histogram_alignment_length.pdf', 'tsv_processing_output_histogram_data.csv')
+    sample = pathlib.Path(aln_file).name
+    return ('tsv_processing_output_figure_histogram_alignment_length_%s.pdf'%(sample), 'tsv_processing_output_histogram_data_%s.csv'%(sample))
+
+def read_sample(aln_file, read_func=concurrent_pipeline.read_blocks):
+    ''' Reader stage of run_samples().
+        Takes the alignment tsv file as input.
+        Returns its content as an in-memory text handle (from read_func).
+    '''
+    return read_func(aln_file)
+
+def process_sample(aln_handle):
+    ''' Processor stage of run_samples().
+        Takes the text handle from read_sample() (or the name of the alignment tsv file) as input.
+        Returns the dataframe from return_best_alignment().
+    '''
+    return return_best_alignment(preprocess_aln_file(aln_handle))
+
+def write_sample(aln_file, best_aln_df, multi_sample=False):
+    ''' Writer stage of run_samples().
+        Takes the input alignment file name and the dataframe from process_sample() as input.
+        Saves the csv and pdf files, checks them and returns their names (tuple).
+    '''
+    pdf_file, csv_file = output_file_names(aln_file, multi_sample)
+    save_csv_file(best_aln_df, csv_file)
+    plot_histogram(best_aln_df, pdf_file)
+    assert check_output_file(pdf_file) == True
+    assert check_output_file(csv_file) == True
+    return (pdf_file, csv_file)
+
+def run_samples(aln_files, read_func=concurrent_pipeline.read_blocks, queue_size=2):
+    ''' Takes a list of alignment tsv files as input.
+        Processes them with concurrent_pipeline.run_pipeline(): the next file is read while the current
+        one is processed and the outputs of the previous one are written.
+        A single input is processed straight from the file, without the pipeline.
+        Returns the names of the output files of each input (list of tuples).
+        Raises ValueError if two inputs would write the same output files.
+    '''
+    if len(aln_files) == 1:
+        # nothing to overlap: read straight from the file, without holding it in memory
+        return [write_sample(aln_files[0], process_sample(aln_files[0]))]
+    return concurrent_pipeline.run_pipeline(aln_files,
+                                            functools.partial(read_sample, read_func=read_func),
+                                            process_sample,
+                                            functools.partial(write_sample, multi_sample=True),
+                                            queue_size=queue_size,
+                                            output_names_func=functools.partial(output_file_names, multi_sample=True))
+
 def main():
-    ''' Usage example: python tsv_processing.py alignment.b6 
+    ''' Usage example: python tsv_processing.py alignment.b6 [more_alignments.b6 ...]
     '''
-    in_file = sys.argv[-1]
-    if in_file == 'tsv_processing.py':
+    in_files = sys.argv[1:]
+    if not in_files:
         raise ValueError('No input file provided...')
-    preprocessed_df = preprocess_aln_file(in_file)
-    best_aln_df = return_best_alignment(preprocessed_df)
-    save_csv_file(best_aln_df)
-    plot_histogram(best_aln_df)
-    assert check_output_file('tsv_processing_output_figure_histogram_alignment_length.pdf') == True
-    assert check_output_file('tsv_processing_output_histogram_data.csv') == True
+    run_samples(in_files)
 
 if __name__ == '__main__':
     main()